@@ -28,12 +28,18 @@ The main improvements from this modular structure are:
 
 """
 import os
+from concurrent.futures import ThreadPoolExecutor
 import sublime
 import sublime_plugin
 from .utils import debug_print, show_error_message, SUBLIME_AVAILABLE
 from .markdown_base_command import MarkdownBaseCommand
 from .project_settings_handler import ProjectSettings
 
+# Generated markdown keeps the Directory Settings block ahead of the file
+# contents, so scanning this much of the buffer is enough to find it
+# without copying a multi-MB view into a Python string.
+_SETTINGS_SCAN_LIMIT = 65536
+
 class Dir2MarkdownCommand(MarkdownBaseCommand):
 
     def _load_settings_for_directory(self, directory):
@@ -47,10 +53,12 @@ class Dir2MarkdownCommand(MarkdownBaseCommand):
         # Create ProjectSettings instance
         self.project_settings = ProjectSettings(self)
 
-        # Get markdown content if we're in a view
+        # Get markdown content if we're in a view. Only the leading slice
+        # is needed to locate the settings block (see _SETTINGS_SCAN_LIMIT).
         markdown_content = None
         if self.view:
-            markdown_content = self.view.substr(sublime.Region(0, self.view.size()))
+            scan_size = min(self.view.size(), _SETTINGS_SCAN_LIMIT)
+            markdown_content = self.view.substr(sublime.Region(0, scan_size))
 
         # Load or create project settings
         local_settings = self.project_settings.ensure_project_settings_exist(directory, markdown_content)
@@ -97,65 +105,82 @@ class Dir2MarkdownCommand(MarkdownBaseCommand):
 
             # Set current markdown file in file processor
             self.file_processor.set_current_markdown(output_file)
+            # Filter decisions are memoized per run; start fresh now that
+            # the configuration for this directory is loaded
+            self.file_processor.reset_decision_cache()
+
+            # Start building markdown content as a list of fragments;
+            # repeated str += would copy the accumulator per append
+            parts = ["# Generated Markdown File\n\n"]
 
-            # Start building markdown content
-            markdown_content = "# Generated Markdown File\n\n"
+            # One traversal supplies both the tree and the file list
+            # (settings files excluded from each); tree text is simply
+            # dropped when the tree section is disabled
+            debug_print("Walking directory for tree and file list")
+            tree_content, all_files = self.markdown_processor.generate_tree_and_files(
+                base_dir, self.config)
 
             # Add directory tree before settings if enabled
             if self.config.get('output_directory_tree', True):
                 debug_print("Adding directory tree to markdown")
-                tree_content = self.markdown_processor.generate_directory_tree(base_dir, self.config)
-                markdown_content += "# Directory Structure\n\n```\n{}\n```\n\n".format(tree_content)
+                parts.append("# Directory Structure\n\n```\n{}\n```\n\n".format(tree_content))
 
             # Get and add settings content
-            markdown_content += "# Directory Settings\n\n"
+            parts.append("# Directory Settings\n\n")
             settings_content = self.project_settings.get_or_create_settings_block(base_dir)
             debug_print("Got settings content")
-            markdown_content += settings_content + "\n\n"
-
-            # Get filtered files (EXCLUDING settings files)
-            all_files = []
-            for root, _, files in os.walk(base_dir):
-                if not self.file_processor.should_process_path(root, is_dir=True):
-                    continue
-
-                for filename in sorted(files):
-                    # CRITICAL: Skip settings files - they're handled in Directory Settings
-                    if filename.endswith('.sublime-settings'):
-                        debug_print("Excluding settings file from file contents: {}".format(filename))
-                        continue
-                    
-                    full_path = os.path.join(root, filename)
-                    if not self.file_processor.should_process_path(full_path):
-                        continue
-
-                    rel_path = os.path.relpath(full_path, base_dir)
-                    all_files.append(rel_path)
-                    debug_print("Found file: {}".format(rel_path))
-
-            markdown_content += "# File Contents\n\n"
-
-            # Add remaining file content
-            for file_path in all_files:
+            parts.append(settings_content + "\n\n")
+
+            parts.append("# File Contents\n\n")
+
+            def read_and_format(file_path):
+                """Read one file and return its formatted block as lines."""
                 try:
                     full_path = os.path.join(base_dir, file_path)
-                    with open(full_path, 'r', encoding='utf-8') as f:
-                        file_content = f.read()
+                    # Read the raw bytes in one sized syscall and decode once,
+                    # skipping the buffered reader and incremental decoder
+                    fd = os.open(full_path, os.O_RDONLY)
+                    try:
+                        data = os.read(fd, os.fstat(fd).st_size)
+                    finally:
+                        os.close(fd)
+                    file_content = data.decode('utf-8')
 
                     block = self.markdown_processor.format_markdown_block(file_path, file_content, self.config)
-                    markdown_content += block + "\n"
-                    debug_print("Added content for: {}".format(file_path))
+                    debug_print("Added content for: %s", file_path)
+                    return block
 
                 except Exception as e:
                     debug_print("Error processing {}: {}".format(file_path, str(e)))
-
-            # Write the content
+                    return None
+
+            # Add remaining file content. The per-file reads are independent
+            # and release the GIL, so overlap their latency across a pool;
+            # executor.map preserves the file order.
+            if all_files:
+                max_workers = min(32, (os.cpu_count() or 1) * 4, len(all_files))
+                # format_markdown_block returns line lists; flattening them
+                # into one list and joining once lets the join preallocate
+                # the whole body instead of materializing each block twice
+                block_lines = []
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    for lines in executor.map(read_and_format, all_files):
+                        if lines:
+                            block_lines.extend(lines)
+                if block_lines:
+                    parts.append('\n'.join(block_lines))
+                    parts.append('\n')
+
+            # Write the content. Only the Sublime path needs the document
+            # as one string (view.insert); standalone mode streams the
+            # fragments through a large write buffer, so the joined copy
+            # is never materialized
             if SUBLIME_AVAILABLE and edit is not None and self.view:
-                self._write_markdown_content(edit, markdown_content)
+                self._write_markdown_content(edit, ''.join(parts))
             else:
                 try:
-                    with open(output_file, 'w', encoding='utf-8') as f:
-                        f.write(markdown_content)
+                    with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                        f.writelines(parts)
                     debug_print("Wrote markdown to: {}".format(output_file))
                 except Exception as e:
                     error_msg = "Error writing to file: {}".format(str(e))
@@ -186,9 +211,16 @@ class Markdown2DirCommand(MarkdownBaseCommand):
         debug_print("Target directory: {}".format(directory))
 
         try:
-            with open(markdown_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                debug_print("Read {} characters from file".format(len(content)))
+            # fstat the open fd for the size and read the whole file in one
+            # sized syscall; avoids the buffered reader's growth loop and
+            # the incremental decoder on multi-MB markdown inputs
+            fd = os.open(markdown_file, os.O_RDONLY)
+            try:
+                data = os.read(fd, os.fstat(fd).st_size)
+            finally:
+                os.close(fd)
+            content = data.decode('utf-8')
+            debug_print("Read {} characters from file".format(len(content)))
         except Exception as e:
             debug_print("Error reading markdown file: {}".format(str(e)))
             show_error_message("Error reading markdown file: {}".format(str(e)))
@@ -32,10 +32,93 @@ The `CodeBlockProcessor` class handles all code block-related operations with th
    - Maintains consistent debug logging
 
 """
+import functools
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from .utils import debug_print
 
+# Compiled once at import time so repeated command invocations skip the
+# re-module cache lookup entirely.
+# Pattern ONLY matches fences at column 0 (no leading whitespace). Both
+# fences are line-anchored and the body uses DOTALL '.' instead of the
+# backtracking-prone [\s\S] class, so unterminated fences fail fast.
+# The optional 'preceding' group captures the line before the fence in
+# the same pass, so filename hints need no second scan per block.
+CODE_BLOCK_RE = re.compile(
+    r'(?:^(?P<preceding>[^\n]*)\n)?'
+    r'^```(?P<lang>[^\n]*)\n(?P<body>.*?)^```',
+    re.MULTILINE | re.DOTALL)
+
+# Matches paths with optional drive letter and slashes. Run against
+# whitespace-split tokens, so the segment classes don't need \s — and
+# without it the quantifiers can't crawl across long prose or
+# base64-like runs while backtracking.
+PATH_RE = re.compile(r'(?:[a-zA-Z]:)?(?:[\\\/])?(?:[\w.-]+[\\\/])*[\w.-]+\.\w+')
+
+# Unanchored variant used when re-indenting fences nested inside block
+# content; unlike CODE_BLOCK_RE it must also match indented fences.
+NESTED_CODE_BLOCK_RE = re.compile(r'```([^\n]*)\n([\s\S]*?)```')
+
+# Matches every line with non-whitespace content; used to comment out
+# existing file content in one substitution pass.
+NONEMPTY_LINE_RE = re.compile(r'^([^\n]*\S[^\n]*)$', re.MULTILINE)
+
+# Detects a leading comment marker and captures the remainder in one
+# match, replacing a per-marker startswith probe.
+COMMENT_STRIP_RE = re.compile(r'(?:#|//|<!--|/\*|;)\s*(.*)$')
+
+def _extract_path_from_text(text):
+    """Extract a file path from text, stripping whitespace."""
+    if not text:
+        return None
+
+    # CRITICAL: Strip whitespace BEFORE pattern matching
+    text = text.strip()
+
+    # Cheap pre-check: every path the pattern can match contains a
+    # dotted extension, so skip the regex for ordinary prose lines
+    if '.' not in text:
+        return None
+
+    # Search token by token rather than across the whole line: the
+    # pattern's segment classes accept spaces, so a line-wide search
+    # could glue prose words onto the path and its restart-per-offset
+    # cost grows with line length. Tokens keep each attempt short.
+    for token in text.split():
+        if '.' not in token:
+            continue
+        match = PATH_RE.search(token)
+        if match:
+            return match.group(0).strip()
+    return None
+
+@functools.lru_cache(maxsize=1024)
+def _resolve_filename(lang_or_filename, preceding_line, first_code_line):
+    """Resolve a block's filename from its fence and surrounding lines.
+
+    Pure function of three short strings, so the path-regex work for
+    repeated headers is memoized across blocks and invocations.
+    """
+    # Try on_fence first
+    if '.' in lang_or_filename:
+        return lang_or_filename
+
+    # Try before_fence if no filename found
+    if preceding_line:
+        extracted = _extract_path_from_text(preceding_line)
+        if extracted:
+            return extracted
+
+    # Try after_fence as last resort
+    if first_code_line:
+        match = COMMENT_STRIP_RE.match(first_code_line.strip())
+        if match:
+            extracted = _extract_path_from_text(match.group(1))
+            if extracted:
+                return extracted
+    return None
+
 class CodeBlockProcessor:
     def __init__(self, parent):
         self.parent = parent
@@ -115,8 +198,8 @@ class CodeBlockProcessor:
                         inside_fence = True
                         reduced_indent = max(0, line_indent - 4)
                         result_lines.append(' ' * reduced_indent + stripped)
-                        debug_print("Reducing nested fence from {} to {} spaces".format(
-                            line_indent, reduced_indent))
+                        debug_print("Reducing nested fence from %d to %d spaces",
+                                    line_indent, reduced_indent)
                     else:
                         result_lines.append(line)
                 else:
@@ -147,18 +230,24 @@ class CodeBlockProcessor:
                 return False
 
         debug_print("Extracting code blocks to: {}".format(output_dir))
-        
-        # Pattern ONLY matches fences at column 0 (no leading whitespace)
-        code_block_pattern = r'^```([^\n]*)\n([\s\S]*?)^```'
-        matches = list(re.finditer(code_block_pattern, content, re.MULTILINE))
+
+        # Existence checks during this pass go through one scandir per
+        # directory instead of a stat per probe
+        self.parent.path_processor.reset_existence_cache()
+
+        matches = list(CODE_BLOCK_RE.finditer(content))
         debug_print("Found {} potential code blocks at column 0".format(len(matches)))
 
         processed_files = set()
+        # Filtering, conflict resolution, and directory creation stay on
+        # this thread (ordering matters for the caches); the writes are
+        # collected and flushed together below
+        write_targets = []
 
         for match in matches:
             try:
                 # Double-check that fence is truly at column 0
-                pos = match.start()
+                pos = match.start('lang') - 3  # start of the ``` fence itself
                 line_start = content.rfind('\n', 0, pos)
                 if line_start == -1:
                     line_start = 0
@@ -170,7 +259,7 @@ class CodeBlockProcessor:
                 
                 if prefix.strip() == '' and len(prefix) > 0:
                     # There's whitespace - skip this indented fence
-                    debug_print("Skipping fence with {} chars whitespace before it".format(len(prefix)))
+                    debug_print("Skipping fence with %d chars whitespace before it", len(prefix))
                     continue
                 
                 # Measure indentation as additional safety check
@@ -179,14 +268,14 @@ class CodeBlockProcessor:
                 line_indent = self.measure_indentation(full_line)
                 
                 if line_indent > 0:
-                    debug_print("Skipping fence with {} spaces indentation".format(line_indent))
+                    debug_print("Skipping fence with %d spaces indentation", line_indent)
                     continue
 
                 debug_print("Processing top-level code block (column 0)")
 
-                lang_or_filename = match.group(1).strip()
-                code = match.group(2)
-                debug_print("Block identifier: '{}'".format(lang_or_filename))
+                lang_or_filename = match.group('lang').strip()
+                code = match.group('body')
+                debug_print("Block identifier: '%s'", lang_or_filename)
 
                 # Check if this should be skipped as a markdown fence
                 # (language="md" with no filename)
@@ -194,12 +283,12 @@ class CodeBlockProcessor:
                     debug_print("Skipping markdown language fence (no filename)")
                     continue
 
-                # Get the line before the code block for potential filename
-                lines = content[:match.start()].split('\n')
-                preceding_line = lines[-1] if lines else None
+                # The line before the code block (potential filename hint)
+                # was captured by the fence regex in the same pass.
+                preceding_line = match.group('preceding')
 
                 filename = self.get_filename_from_block(lang_or_filename, code, preceding_line, config)
-                debug_print("Resolved filename: '{}'".format(filename))
+                debug_print("Resolved filename: '%s'", filename)
 
                 if not filename:
                     debug_print("No filename found for block, skipping")
@@ -207,39 +296,49 @@ class CodeBlockProcessor:
 
                 # Skip files we've already processed
                 if filename in processed_files:
-                    debug_print("Already processed {}, skipping".format(filename))
+                    debug_print("Already processed %s, skipping", filename)
                     continue
                 processed_files.add(filename)
 
                 if self.should_ignore_block(lang_or_filename, code, filename, config):
-                    debug_print("Skipping {} based on block ignore settings".format(filename))
+                    debug_print("Skipping %s based on block ignore settings", filename)
                     continue
 
                 # Skip files in .git directory
                 if '.git' in filename.split(os.sep):
-                    debug_print("Skipping file in .git directory: {}".format(filename))
+                    debug_print("Skipping file in .git directory: %s", filename)
                     continue
 
                 output_path = self.parent.path_processor.resolve_output_path(output_dir, filename, config)
                 if not output_path:
                     continue
 
-                debug_print("Writing to: {}".format(output_path))
+                debug_print("Writing to: %s", output_path)
 
                 # Process nested code fences in the content
                 # Reduce indentation of any nested fences by 4 spaces
                 processed_code = self.process_nested_fences(code)
 
-                # Write the file
-                code_content = processed_code.strip()
+                # Write the file with a single os.write of pre-encoded bytes,
+                # skipping the TextIOWrapper/BufferedWriter chain per block.
+                # Whitespace is trimmed on the encoded buffer through index
+                # arithmetic and a memoryview slice, so the block is copied
+                # once (the encode) instead of strip + encode
+                data = processed_code.encode('utf-8')
+                start, end = 0, len(data)
+                while start < end and data[start] in b' \t\r\n':
+                    start += 1
+                while end > start and data[end - 1] in b' \t\r\n':
+                    end -= 1
                 try:
-                    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-                    with open(output_path, 'w', encoding='utf-8') as f:
-                        f.write(code_content)
-                    debug_print("Successfully created file: {}".format(output_path))
+                    # Cached per run: repeated blocks in the same directory
+                    # skip the makedirs stat chain
+                    self.parent.path_processor.ensure_directory_exists(output_path)
                 except Exception as e:
-                    debug_print("Error writing file {}: {}".format(output_path, str(e)))
+                    debug_print("Error preparing directory for {}: {}".format(output_path, str(e)))
                     continue
+                write_targets.append((output_path, memoryview(data)[start:end]))
+                self.parent.path_processor.mark_exists(output_path)
 
             except Exception as e:
                 debug_print("Error processing code block: {}".format(str(e)))
@@ -247,8 +346,36 @@ class CodeBlockProcessor:
                 debug_print(traceback.format_exc())
                 continue
 
+        self._flush_writes(write_targets)
         return True
 
+    def _flush_writes(self, write_targets):
+        """Write collected (path, bytes) pairs, overlapping I/O when many.
+
+        Each write releases the GIL, so block-heavy markdown benefits
+        from a small pool; below the threshold the pool's setup cost
+        outweighs the overlap and the writes run inline.
+        """
+        def write_one(target):
+            path, data = target
+            try:
+                fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                try:
+                    os.write(fd, data)
+                finally:
+                    os.close(fd)
+                debug_print("Successfully created file: %s", path)
+            except Exception as e:
+                debug_print("Error writing file {}: {}".format(path, str(e)))
+
+        if len(write_targets) >= 8:
+            max_workers = min(16, (os.cpu_count() or 1) * 4)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                list(executor.map(write_one, write_targets))
+        else:
+            for target in write_targets:
+                write_one(target)
+
     def merge_code_blocks(self, existing_content, new_content):
         """Merge two code blocks line by line, preserving order and adding new content."""
         existing_lines = existing_content.strip().split('\n')
@@ -294,113 +421,86 @@ class CodeBlockProcessor:
     def get_filename_from_block(self, lang_or_filename, code, preceding_line, config):
         """Extract filename from code block using configured convention."""
         debug_print("get_filename_from_block input:")
-        debug_print("  lang_or_filename: '{}'".format(lang_or_filename))
-        debug_print("  preceding_line: '{}'".format(preceding_line))
-        debug_print("  code first line: '{}'".format(code.splitlines()[0] if code else None))
-
-        def sanitize_path(path):
-            if path:
-                return self.parent.path_processor.normalize_path(path)
-            debug_print("  sanitize_path received None")
-            return None
+        debug_print("  lang_or_filename: '%s'", lang_or_filename)
+        debug_print("  preceding_line: '%s'", preceding_line)
 
-        def extract_path_from_text(text):
-            """Extract file path from text, stripping whitespace."""
-            if not text:
-                debug_print("  extract_path got empty text")
-                return None
-            
-            # CRITICAL: Strip whitespace BEFORE pattern matching
-            text = text.strip()
-            
-            # Pattern matches paths with optional drive letter and slashes
-            path_pattern = r'(?:[a-zA-Z]:)?(?:[\\\/])?(?:[\w\s.-]+[\\\/])*[\w\s.-]+\.\w+'
-            match = re.search(path_pattern, text)
-            
-            if match:
-                # CRITICAL: Strip whitespace from the matched result
-                result = match.group(0).strip()
-                debug_print("  extracted path from text: '{}'".format(result))
-                return result
-            
-            debug_print("  no path found in text")
-            return None
+        # Only the first code line matters to the resolution, so the
+        # decision depends on three short strings; repeated headers
+        # (empty preceding lines, recurring comments) hit the cache
+        first_code_line = code.partition('\n')[0] if code else None
+        debug_print("  code first line: '%s'", first_code_line)
 
-        naming_convention = config.get("file_naming_convention", "on_fence")
-        debug_print("  using naming convention: {}".format(naming_convention))
-        filename = None
+        filename = _resolve_filename(str(lang_or_filename), preceding_line, first_code_line)
 
-        # Try on_fence first
-        if '.' in str(lang_or_filename):
-            filename = lang_or_filename
-            debug_print("  found filename in fence: '{}'".format(filename))
-
-        # Try before_fence if no filename found
-        if not filename and preceding_line:
-            extracted = extract_path_from_text(preceding_line)
-            if extracted:
-                filename = extracted
-                debug_print("  found filename in preceding line: '{}'".format(filename))
-
-        # Try after_fence as last resort
-        if not filename and code:
-            first_line = code.splitlines()[0].strip()
-            comment_chars = ['#', '//', '<!--', '/*', ';']
-            for char in comment_chars:
-                if first_line.startswith(char):
-                    clean_line = first_line[len(char):].strip()
-                    extracted = extract_path_from_text(clean_line)
-                    if extracted:
-                        filename = extracted
-                        debug_print("  found filename in first code line: '{}'".format(filename))
-                        break
-
-        result = sanitize_path(filename)
-        debug_print("  final filename: '{}'".format(result))
+        if filename:
+            result = self.parent.path_processor.normalize_path(filename)
+        else:
+            result = None
+        debug_print("  final filename: '%s'", result)
         return result
 
     def should_ignore_block(self, lang, code, filename, config):
-        """Determine if a code block should be ignored based on configuration settings."""
-        blocks_ignored = config.get('blocks_ignored', [])
+        """Determine if a code block should be ignored based on configuration settings.
+
+        Checks run cheapest-first so most ignored blocks bail before any
+        allocation: emptiness and the name/extension rules are index and
+        hash work, line counting strips the block, and the content rules
+        lowercase it.
+        """
+        # Check if code is empty; isspace avoids the stripped copy
+        if not code or code.isspace():
+            debug_print("Ignoring empty block")
+            return True
+
+        # The frozenset is stashed on the config dict so the extract loop
+        # builds it once per pass rather than per block
+        blocks_ignored = config.get('_blocks_ignored_set')
+        if blocks_ignored is None:
+            blocks_ignored = frozenset(config.get('blocks_ignored', ()))
+            config['_blocks_ignored_set'] = blocks_ignored
 
         # Check if block is nameless
         if 'nameless' in blocks_ignored and not filename:
             debug_print("Ignoring nameless block")
             return True
 
-        # Check minimum line count
+        # Check if file has extension
+        if 'without_ext' in blocks_ignored and filename:
+            if not os.path.splitext(filename)[1]:
+                debug_print("Ignoring block without extension")
+                return True
+
+        # Check minimum line count; counting newlines avoids allocating a
+        # list of every line just to measure the block
         if 'lessthan_3' in blocks_ignored:
-            if len(code.strip().splitlines()) < 3:
+            if code.strip().count('\n') < 2:
                 debug_print("Ignoring block with less than 3 lines")
                 return True
 
         # Check for readme or properties content
         # NOTE: Only check content, not filename, to avoid false positives
+        # Lowercase the block at most once and share it between the checks
+        code_lower = None
         if 'readme' in blocks_ignored:
             # Only ignore if the content is predominantly readme-like
             # (not just a file that happens to be named README.md)
             if filename and 'readme' in filename.lower():
                 # It's a README file - don't auto-ignore based on content
                 pass
-            elif any(x in code.lower() for x in ['# readme', '## readme']):
-                debug_print("Ignoring readme content block")
-                return True
-
-        if 'properties' in blocks_ignored and any(x in code.lower() for x in ['properties', 'PROPERTIES']):
-            debug_print("Ignoring properties block")
-            return True
-
-        # Check if file has extension
-        if 'without_ext' in blocks_ignored and filename:
-            if not os.path.splitext(filename)[1]:
-                debug_print("Ignoring block without extension")
+            else:
+                code_lower = code.lower()
+                # '# readme' also matches inside '## readme'
+                if '# readme' in code_lower:
+                    debug_print("Ignoring readme content block")
+                    return True
+
+        if 'properties' in blocks_ignored:
+            if code_lower is None:
+                code_lower = code.lower()
+            if 'properties' in code_lower:
+                debug_print("Ignoring properties block")
                 return True
 
-        # Check if code is empty
-        if not code.strip():
-            debug_print("Ignoring empty block")
-            return True
-
         return False
 
     def is_indented_code_block(self, match, content):
@@ -416,10 +516,8 @@ class CodeBlockProcessor:
         line_prefix = content[line_start:pos]
         stripped_prefix = line_prefix.strip()
 
-        debug_print("Code block line prefix: '{}', stripped: '{}'".format(
-            line_prefix.replace(' ', '·'),
-            stripped_prefix
-        ))
+        debug_print("Code block line prefix: '%s', stripped: '%s'",
+                    line_prefix.replace(' ', '·'), stripped_prefix)
 
         if stripped_prefix or line_prefix.startswith('    ') or line_prefix.startswith('\t'):
             debug_print("Determined code block is indented")
@@ -428,27 +526,37 @@ class CodeBlockProcessor:
         debug_print("Determined code block is not indented")
         return False
 
-    def _comment_lines(self, lines, start_comment, end_comment):
-        """Add comments to a set of lines using the appropriate syntax."""
-        commented_lines = []
-        for line in lines:
-            if line.strip():
-                if end_comment:
-                    commented_lines.append("{} {} {}".format(start_comment, line, end_comment))
-                else:
-                    commented_lines.append("{} {}".format(start_comment, line))
-            else:
-                commented_lines.append(line)
-        return commented_lines
+    def _comment_lines(self, text, start_comment, end_comment):
+        """Comment out every non-empty line of text using the given syntax.
+
+        A single multiline substitution replaces the old per-line Python
+        loop; blank lines are left untouched as before.
+        """
+        # Precomputed prefix/suffix concat; .format would re-parse its
+        # template for every line
+        prefix = start_comment + " "
+        if end_comment:
+            suffix = " " + end_comment
+            def repl(match):
+                return prefix + match.group(1) + suffix
+        else:
+            def repl(match):
+                return prefix + match.group(1)
+        return NONEMPTY_LINE_RE.sub(repl, text)
 
     def find_code_injection_point(self, file_content, code_block, ext):
         """Find injection points in existing file based on code block content."""
         debug_print("Analyzing for code injection points")
 
+        # Split once for whichever helper runs; splitlines also copes
+        # with \r\n endings, unlike split('\n')
+        file_lines = file_content.splitlines()
+        code_lines = code_block.strip().splitlines()
+
         if ext == 'py':
-            return self._find_python_injection_points(file_content.split('\n'), code_block.strip().split('\n'))
+            return self._find_python_injection_points(file_lines, code_lines)
 
-        return self._find_general_injection_points(file_content.split('\n'), code_block.strip().split('\n'))
+        return self._find_general_injection_points(file_lines, code_lines)
 
     def _find_python_injection_points(self, file_lines, code_lines):
         """Find injection points specifically for Python files."""
@@ -516,10 +624,10 @@ class CodeBlockProcessor:
                 if file_lines[i].strip() == last_line:
                     return start_idx, i
 
-        brace_count = 0
-        for line in code_lines[1:]:
-            brace_count += line.count('{')
-            brace_count -= line.count('}')
+        # Two C-level scans over the joined tail instead of a Python loop
+        # with two count calls per line
+        tail = '\n'.join(code_lines[1:])
+        brace_count = tail.count('{') - tail.count('}')
 
         current_count = 0
         for i in range(start_idx + 1, len(file_lines)):
@@ -539,33 +647,43 @@ class CodeBlockProcessor:
             with open(file_path, 'r', encoding='utf-8') as f:
                 existing_content = f.read()
 
-            commented_content = self._comment_lines(existing_content.split('\n'), start_comment, end_comment)
-            new_content = code + '\n\n' + '\n'.join(commented_content)
+            commented_content = self._comment_lines(existing_content, start_comment, end_comment)
 
+            # Write the pieces straight to the buffered handle rather than
+            # concatenating another document-sized string first
             with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(new_content)
+                f.write(code)
+                f.write('\n\n')
+                f.write(commented_content)
 
         elif conflict_handling == 'append_n_to_filename':
             base, ext = os.path.splitext(file_path)
+            path_processor = self.parent.path_processor
             counter = 1
-            while os.path.exists("{}_{}{}".format(base, counter, ext)):
+            candidate = "{}_{}{}".format(base, counter, ext)
+            while path_processor.path_exists(candidate):
                 counter += 1
-            with open("{}_{}{}".format(base, counter, ext), 'w', encoding='utf-8') as f:
+                candidate = "{}_{}{}".format(base, counter, ext)
+            with open(candidate, 'w', encoding='utf-8') as f:
                 f.write(code)
+            path_processor.mark_exists(candidate)
 
         elif conflict_handling == 'move_to_backup_dir':
             backup_dir = os.path.join(os.path.dirname(file_path), 'backup')
             os.makedirs(backup_dir, exist_ok=True)
             backup_path = os.path.join(backup_dir, os.path.basename(file_path))
+            path_processor = self.parent.path_processor
 
-            if os.path.exists(backup_path):
+            if path_processor.path_exists(backup_path):
                 base, ext = os.path.splitext(backup_path)
                 counter = 1
-                while os.path.exists("{}_{}{}".format(base, counter, ext)):
-                    counter += 1
                 backup_path = "{}_{}{}".format(base, counter, ext)
+                while path_processor.path_exists(backup_path):
+                    counter += 1
+                    backup_path = "{}_{}{}".format(base, counter, ext)
 
-            os.rename(file_path, backup_path)
+            os.replace(file_path, backup_path)
+            path_processor.mark_exists(backup_path)
             with open(file_path, 'w', encoding='utf-8') as f:
                 f.write(code)
 
@@ -595,13 +713,11 @@ class CodeBlockProcessor:
 
     def process_code_block(self, code):
         """Process code content, handling nested code blocks through indentation."""
-        code_block_pattern = r'```([^\n]*)\n([\s\S]*?)```'
-
         def replace_code_blocks(match):
             block = match.group(0)
             return self.parent.project_settings.indent_code_block(block)
 
-        processed_code = re.sub(code_block_pattern, replace_code_blocks, code)
+        processed_code = NESTED_CODE_BLOCK_RE.sub(replace_code_blocks, code)
         return processed_code
 
     def format_code_block(self, content, filename):
@@ -60,6 +60,49 @@ class FileProcessor:
         self.parent = parent
         self.view = parent.view if parent else None
         self.current_markdown_file = None
+        self._decision_cache = {}
+        self._ext_filters = None
+        self._name_filters_cache = None
+
+    def reset_decision_cache(self):
+        """Drop memoized should_process_path results.
+
+        Called at the start of a command run so decisions reflect the
+        freshly loaded configuration.
+        """
+        self._decision_cache = {}
+        self._ext_filters = None
+        self._name_filters_cache = None
+
+    def _name_filters(self, config):
+        """Return the file/directory name lists as frozensets, built once.
+
+        Same lifetime as the extension filters: rebuilt after
+        reset_decision_cache so they track the loaded configuration.
+        """
+        filters = self._name_filters_cache
+        if filters is None:
+            filters = {
+                'files_include': frozenset(config.get('files_2_include') or ()),
+                'files_ignore': frozenset(config.get('files_2_ignore') or ()),
+                'dirs_include': frozenset(config.get('directories_2_include') or ()),
+                'dirs_ignore': frozenset(config.get('directories_2_ignore') or ()),
+            }
+            self._name_filters_cache = filters
+        return filters
+
+    def _extension_filters(self, config):
+        """Return the configured extension lists as frozensets, built once.
+
+        Membership is then a hash lookup per file instead of a list scan;
+        rebuilt after reset_decision_cache alongside the decisions.
+        """
+        filters = self._ext_filters
+        if filters is None:
+            filters = (frozenset(config.get('extensions_2_include') or ()),
+                       frozenset(config.get('extensions_2_ignore') or ()))
+            self._ext_filters = filters
+        return filters
 
     def is_binary_file(self, file_path):
         """Check if a file is binary by reading its first few bytes."""
@@ -81,7 +124,8 @@ class FileProcessor:
 
     def is_markdown_file(self, file_path):
         """Check if a file is a markdown file."""
-        return file_path and file_path.lower().endswith(('.md', '.markdown', '.mdown', '.mkd', '.mkdn', '.txt'))
+        from .markdown_base_command import MD_EXTS
+        return bool(file_path) and file_path.rpartition('.')[2].lower() in MD_EXTS
 
     def _is_in_ignored_directory(self, path):
         """Check if path is within any ignored directory."""
@@ -91,27 +135,39 @@ class FileProcessor:
             debug_print("No configuration available for directory check")
             return False
 
-        directories_to_ignore = config.get('directories_2_ignore', [])
-        path_parts = path.split(os.sep)
-
-        # Check if any component of the path matches an ignored directory
-        for directory in directories_to_ignore:
-            if directory in path_parts:
-                debug_print("Path '{}' is within ignored directory '{}'".format(path,directory))
-                return True
+        # One C-level disjointness test over the path components instead
+        # of a membership scan per ignored directory
+        directories_to_ignore = self._name_filters(config)['dirs_ignore']
+        if directories_to_ignore and not directories_to_ignore.isdisjoint(path.split(os.sep)):
+            debug_print("Path '%s' is within an ignored directory", path)
+            return True
         return False
 
     def should_process_path(self, path, is_dir=False, code_block=None):
-        """Unified path processing check with improved filtering."""
+        """Unified path processing check with improved filtering.
+
+        Results are memoized per (path, is_dir): the directory tree
+        generation and the file walk both evaluate the same paths, so
+        each decision (including the binary-file sniff) runs once.
+        """
+        key = (os.path.normpath(path), is_dir)
+        cached = self._decision_cache.get(key)
+        if cached is not None:
+            return cached
+        result = self._evaluate_path(key[0], is_dir, code_block)
+        self._decision_cache[key] = result
+        return result
+
+    def _evaluate_path(self, path, is_dir=False, code_block=None):
+        """Apply all configured filters to an already-normalized path."""
         try:
             config = self.parent.config
         except AttributeError:
             debug_print("No configuration available, using defaults")
             config = {}
 
-        path = os.path.normpath(path)
         path_name = os.path.basename(path)
-        debug_print("Checking path: {}".format(path))
+        debug_print("Checking path: %s", path)
 
         # Always skip the current markdown file
         if self.current_markdown_file and path == self.current_markdown_file:
@@ -121,25 +177,25 @@ class FileProcessor:
         # Always skip .git directories and their contents
         path_parts = path.split(os.sep)
         if '.git' in path_parts:
-            debug_print("Skipping .git path: {}".format(path))
+            debug_print("Skipping .git path: %s", path)
             return False
 
         # Check if path is within any ignored directory
         if self._is_in_ignored_directory(path):
-            debug_print("REJECTED: Path '{}' is within an ignored directory".format(path))
+            debug_print("REJECTED: Path '%s' is within an ignored directory", path)
             return False
 
         # Directory processing
         if is_dir:
             # System folder check
             if path_name.startswith('.') and not config.get('include_system_folders', False):
-                debug_print("Skipping system directory: {}".format(path_name))
+                debug_print("Skipping system directory: %s", path_name)
                 return False
 
             # Check directories_2_include
-            directories_to_include = config.get('directories_2_include', [])
+            directories_to_include = self._name_filters(config)['dirs_include']
             if directories_to_include and path_name not in directories_to_include:
-                debug_print("REJECTED: Directory '{}' not in include list".format(path_name))
+                debug_print("REJECTED: Directory '%s' not in include list", path_name)
                 return False
 
             return True
@@ -148,45 +204,47 @@ class FileProcessor:
         debug_print("Processing as file...")
 
         # Check specific files lists first
-        files_to_include = config.get('files_2_include', [])
+        name_filters = self._name_filters(config)
+        files_to_include = name_filters['files_include']
         if files_to_include and path_name not in files_to_include:
-            debug_print("REJECTED: File '{}' not in include list".format(path_name))
+            debug_print("REJECTED: File '%s' not in include list", path_name)
             return False
 
-        files_to_ignore = config.get('files_2_ignore', [])
+        files_to_ignore = name_filters['files_ignore']
         if path_name in files_to_ignore:
-            debug_print("REJECTED: File '{}' in ignore list".format(path_name))
+            debug_print("REJECTED: File '%s' in ignore list", path_name)
             return False
 
         # Check partial names
         partial_names_to_include = config.get('partial_names_2_include', [])
         if partial_names_to_include and not any(partial in path_name for partial in partial_names_to_include):
-            debug_print("REJECTED: File '{}' doesn't match any partial include patterns".format(path_name))
+            debug_print("REJECTED: File '%s' doesn't match any partial include patterns", path_name)
             return False
 
         partial_names_to_ignore = config.get('partial_names_2_ignore', [])
         if any(partial in path_name for partial in partial_names_to_ignore):
-            debug_print("REJECTED: File '{}' matches ignored partial pattern".format(path_name))
+            debug_print("REJECTED: File '%s' matches ignored partial pattern", path_name)
             return False
 
-        # Extension checks
-        _, ext = os.path.splitext(path_name)
-        ext = ext[1:].lower() if ext else ''
+        # Extension checks; skip the path parsing entirely when neither
+        # set is configured (the default)
+        extensions_to_include, extensions_to_ignore = self._extension_filters(config)
+        if extensions_to_include or extensions_to_ignore:
+            _, ext = os.path.splitext(path_name)
+            ext = ext[1:].lower() if ext else ''
 
-        extensions_to_include = config.get('extensions_2_include', [])
-        if extensions_to_include and ext not in extensions_to_include:
-            debug_print("REJECTED: Extension '{}' not in include list".format(ext))
-            return False
+            if extensions_to_include and ext not in extensions_to_include:
+                debug_print("REJECTED: Extension '%s' not in include list", ext)
+                return False
 
-        extensions_to_ignore = config.get('extensions_2_ignore', [])
-        if ext in extensions_to_ignore:
-            debug_print("REJECTED: Extension '{}' in ignore list".format(ext))
-            return False
+            if ext in extensions_to_ignore:
+                debug_print("REJECTED: Extension '%s' in ignore list", ext)
+                return False
 
         # Binary file check
         if os.path.isfile(path) and self.is_binary_file(path):
-            debug_print("REJECTED: File '{}' is binary".format(path_name))
+            debug_print("REJECTED: File '%s' is binary", path_name)
             return False
 
-        debug_print("ACCEPTED: File '{}' passed all checks".format(path_name))
+        debug_print("ACCEPTED: File '%s' passed all checks", path_name)
         return True
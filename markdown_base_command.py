@@ -13,6 +13,7 @@ Organization the remaining implementations:
 
 """
 import os
+import functools
 import sublime
 import sublime_plugin
 from .file_processor import FileProcessor
@@ -22,24 +23,32 @@ from .markdown_processor import MarkdownProcessor
 from .project_settings_handler import ProjectSettings
 from .utils import debug_print, SUBLIME_AVAILABLE
 
+# Extensions treated as markdown sources; .txt stays because plain-text
+# notes are accepted as input alongside the markdown variants.
+MD_EXTS = frozenset(('md', 'markdown', 'mdown', 'mkd', 'mkdn', 'txt'))
+
 class MarkdownBaseCommand(sublime_plugin.TextCommand):
     _config_cache = None
 
-    COMMENT_SYNTAX = {
-        "py": "#",        # Python
-        "cpp": "//",      # C++
-        "c": "//",        # C
-        "js": "//",       # JavaScript
-        "java": "//",     # Java
-        "html": "<!--",   # HTML
-        "xml": "<!--",    # XML
-        "css": "/*",      # CSS
-    }
-
-    BLOCK_COMMENT_END = {
-        "html": "-->",
-        "xml": "-->",
-        "css": "*/"
+    # extension -> (start_comment, end_comment, language). One lookup
+    # serves both get_comment_syntax and get_file_language; the comment
+    # defaults for entries the old two-table setup didn't cover are kept
+    # as-is ("#" start, no end).
+    EXT_INFO = {
+        "py": ("#", "", "python"),
+        "cpp": ("//", "", "c++"),
+        "hpp": ("#", "", "c++"),
+        "h": ("#", "", "c++"),
+        "c": ("//", "", "c"),
+        "cs": ("#", "", "csharp"),
+        "js": ("//", "", "javascript"),
+        "java": ("//", "", "java"),
+        "html": ("<!--", "-->", "html"),
+        "xml": ("<!--", "-->", "xml"),
+        "css": ("/*", "*/", "css"),
+        "sql": ("#", "", "sql"),
+        "md": ("#", "", "markdown"),
+        "txt": ("#", "", "text"),
     }
 
     def __init__(self, view):
@@ -110,35 +119,32 @@ class MarkdownBaseCommand(sublime_plugin.TextCommand):
             return False
         return True
 
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _file_ext(file_path):
+        """Lowercased extension without the dot, memoized per path.
+
+        Shared by the comment-syntax and language lookups so a path is
+        splitext'd once however many methods inspect it.
+        """
+        return os.path.splitext(file_path)[1][1:].lower()
+
     def get_comment_syntax(self, file_path):
         """Get comment syntax for a given file type."""
-        ext = os.path.splitext(file_path)[1][1:]  # Get extension without the dot
-        start_comment = self.COMMENT_SYNTAX.get(ext, "#")  # Default to "#" if unknown
-        end_comment = self.BLOCK_COMMENT_END.get(ext, "")  # Default to "" if none
-        debug_print("Comments used, open: {}, close: {}".format(start_comment, end_comment))
+        ext = self._file_ext(file_path)
+        start_comment, end_comment, _ = self.EXT_INFO.get(ext, ("#", "", ext))
+        debug_print("Comments used, open: %s, close: %s", start_comment, end_comment)
         return start_comment, end_comment
 
     def is_markdown_file(self):
         """Check if current file is a markdown file."""
+        # One hash lookup on the lowercased extension instead of six
+        # sequential suffix checks on the lowercased full path
         file_name = self.view.file_name()
-        return file_name and file_name.lower().endswith(('.md', '.markdown', '.mdown', '.mkd', '.mkdn', '.txt'))
+        return bool(file_name) and file_name.rpartition('.')[2].lower() in MD_EXTS
 
     def get_file_language(self, filename):
         """Determine language from file extension."""
-        ext = os.path.splitext(filename)[1][1:].lower()
-        ext_to_lang = {
-            'py': 'python',
-            'js': 'javascript',
-            'cpp': 'c++',
-            'hpp': 'c++',
-            'h': 'c++',
-            'c': 'c',
-            'cs': 'csharp',
-            'java': 'java',
-            'html': 'html',
-            'css': 'css',
-            'sql': 'sql',
-            'md': 'markdown',
-            'txt': 'text'
-        }
-        return ext_to_lang.get(ext, ext)
+        ext = self._file_ext(filename)
+        info = self.EXT_INFO.get(ext)
+        return info[2] if info else ext
@@ -46,23 +46,50 @@ import sublime
 import sublime_plugin
 from .utils import debug_print, SUBLIME_AVAILABLE
 
+# Compiled once at import time; insert_code_blocks runs this against the
+# whole markdown buffer on every invocation. Both fences are line-anchored
+# (CommonMark semantics) and the body uses DOTALL '.' instead of the
+# backtracking-prone [\s\S] class, so unterminated fences fail fast.
+CODE_BLOCK_RE = re.compile(r'^```([^\n]*)\n(.*?)^```', re.MULTILINE | re.DOTALL)
+
+# Tree-drawing pieces indexed by is_last, replacing per-item ternaries in
+# the formatting loop.
+_TREE_TEE = ("├── ", "└── ")
+_TREE_PAD = ("│   ", "    ")
+
 class MarkdownProcessor:
     def __init__(self, parent):
         self.parent = parent
         self.view = parent.view
+        self._md_filenames_cache = None
 
     def extract_code_blocks_from_markdown(self):
-        """Extract filenames of code blocks from the markdown file."""
-        file_content = self.view.file_name()
-        code_block_pattern = r'```(?:[^\n]*)\n([\s\S]*?)```'
-        matches = re.findall(code_block_pattern, file_content)
-        filenames = set()
+        """Extract filenames of code blocks from the markdown view.
+
+        The parse is cached against the view's change count, so repeated
+        membership checks during one traversal regex the buffer once.
+        (This previously matched against view.file_name() — the path
+        string, not the content — so it always came back empty.)
+        """
+        view = self.view
+        if not view:
+            return frozenset()
 
-        for match in matches:
-            filename_line = match.splitlines()[0].strip()
+        key = (view.file_name(),
+               view.change_count() if hasattr(view, 'change_count') else None)
+        cached = self._md_filenames_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        content = view.substr(sublime.Region(0, view.size()))
+        filenames = set()
+        for match in CODE_BLOCK_RE.finditer(content):
+            filename_line = match.group(2).partition('\n')[0].strip()
             filenames.add(filename_line)
 
-        return filenames
+        result = frozenset(filenames)
+        self._md_filenames_cache = (key, result)
+        return result
 
     def generate_markdown_content(self, directory, files, config):
         """Generates markdown content from files."""
@@ -85,12 +112,17 @@ class MarkdownProcessor:
         for file_path in files:
             try:
                 full_path = os.path.join(directory, file_path)
-                with open(full_path, 'r', encoding='utf-8') as f:
-                    file_content = f.read()
-
-                block = self.format_markdown_block(file_path, file_content, config)
-                content.append(block)
-                debug_print("Added content for: {}".format(file_path))
+                # One fstat-sized read per file; skips the buffered reader
+                # and incremental decoder like the command-level loops
+                fd = os.open(full_path, os.O_RDONLY)
+                try:
+                    data = os.read(fd, os.fstat(fd).st_size)
+                finally:
+                    os.close(fd)
+                file_content = data.decode('utf-8')
+
+                content.extend(self.format_markdown_block(file_path, file_content, config))
+                debug_print("Added content for: %s", file_path)
 
             except Exception as e:
                 debug_print("Error processing {}: {}".format(file_path, str(e)))
@@ -109,7 +141,7 @@ class MarkdownProcessor:
         
         # Check if it's a .sublime-settings file
         if basename.endswith('.sublime-settings'):
-            debug_print("Identified settings file: {}".format(filename))
+            debug_print("Identified settings file: %s", filename)
             return True
         
         return False
@@ -146,6 +178,10 @@ class MarkdownProcessor:
         Format a single file as a markdown code block.
         Automatically indents any nested code fences found in the content.
         ALSO indents before_fence path lines when content has nested fences.
+
+        Returns the block as a list of lines; callers extend their own
+        line list and run one terminal join, so each block's text is
+        materialized once in the final document instead of twice.
         """
         naming_convention = config.get("file_naming_convention", "on_fence")
         lines = []
@@ -155,7 +191,7 @@ class MarkdownProcessor:
 
         # If content has code fences, indent them
         if has_nested_fences:
-            debug_print("File {} contains nested code fences, adding indentation".format(file_path))
+            debug_print("File %s contains nested code fences, adding indentation", file_path)
             content = self.indent_nested_fences(content)
 
         # Format based on naming convention
@@ -181,115 +217,117 @@ class MarkdownProcessor:
         lines.append(content.rstrip())
         lines.append("```")
         lines.append("")  # Empty line after block
-        return "\n".join(lines)
+        return lines
 
     def generate_directory_tree(self, base_dir, config):
         """
         Generate a visual directory tree structure with improved filtering.
-        
+
         IMPORTANT: Excludes .sublime-settings files from the tree since they
         are shown in the "Directory Settings" section.
         """
-        debug_print("Generating directory tree for: {}".format(base_dir))
+        return self.generate_tree_and_files(base_dir, config)[0]
 
-        def get_directory_with_included_files(dir_path):
-            """Check if directory contains any included files (recursively)."""
-            has_included_files = False
-            for root, dirs, files in os.walk(dir_path):
-                for file in files:
-                    full_path = os.path.join(root, file)
-                    
-                    # Skip settings files - they're in Directory Settings section
-                    if self.is_settings_file(file):
-                        continue
-                    
-                    if self.parent.file_processor.should_process_path(full_path, is_dir=False):
-                        has_included_files = True
-                        break
-                if has_included_files:
-                    break
-            return has_included_files
-
-        def format_tree_line(name, prefix="", is_last=True):
-            """Format a single line of the tree."""
-            return "{}{}{}".format(
-                prefix,
-                "└── " if is_last else "├── ",
-                name
-            )
-
-        def build_tree(current_path, prefix=""):
-            """Recursively build the tree structure."""
-            lines = []
-            try:
-                # Get directory contents
-                items = os.listdir(current_path)
+    def generate_tree_and_files(self, base_dir, config):
+        """Walk the directory once, returning (tree_text, relative paths).
 
-                # Separate directories and files
-                dirs = []
-                files = []
-
-                for item in sorted(items):
-                    full_path = os.path.join(current_path, item)
+        Dir2Markdown needs both the visual tree and the list of files to
+        embed; producing them from the same scandir traversal halves the
+        walk instead of re-stating every entry for each product.
+        """
+        debug_print("Generating directory tree for: {}".format(base_dir))
 
-                    if os.path.isdir(full_path):
+        file_processor = self.parent.file_processor
+        all_files = []
+
+        # Names rejected on sight, before the is_dir call (which can cost
+        # a lookup on network filesystems) and before the full filter
+        # runs. Any path component in directories_2_ignore fails
+        # should_process_path anyway, so this only short-circuits.
+        ignored_names = frozenset(config.get('directories_2_ignore') or ()) | {'.git'}
+
+        def collect(dir_path, rel_parent):
+            """Gather included entries in one scandir pass per directory.
+
+            Returns (dirs, files) where dirs maps name -> child tuple and
+            files is the list of included filenames. Empty subtrees come
+            back as (empty, empty) and are dropped by the caller, which
+            replaces the old walk-the-whole-subtree emptiness probe per
+            directory. DirEntry answers is_dir from the cached stat, so
+            no extra syscalls per entry.
+            """
+            dirs = {}
+            files = []
+            try:
+                entries = os.scandir(dir_path)
+            except OSError as e:
+                debug_print("Error accessing directory {}: {}".format(dir_path, str(e)))
+                return dirs, files
+            with entries:
+                for entry in entries:
+                    if entry.name in ignored_names:
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        # Rejected directories are never descended into,
+                        # so the whole subtree is skipped
+                        if not file_processor.should_process_path(entry.path, is_dir=True):
+                            continue
+                        child = collect(entry.path, rel_parent + entry.name + os.sep)
                         # Only include directory if it contains files we want
-                        if get_directory_with_included_files(full_path):
-                            dirs.append(item)
+                        if child[0] or child[1]:
+                            dirs[entry.name] = child
                     else:
-                        # Skip settings files
-                        if self.is_settings_file(item):
-                            debug_print("Excluding settings file from tree: {}".format(item))
+                        # Skip settings files - they're in Directory Settings section
+                        if self.is_settings_file(entry.name):
+                            debug_print("Excluding settings file from tree: %s", entry.name)
                             continue
-                        
-                        # Apply file filters
-                        if self.parent.file_processor.should_process_path(full_path, is_dir=False):
-                            files.append(item)
-
-                # Combine filtered items
-                filtered_items = dirs + files
-
-                # Generate tree lines
-                for idx, item in enumerate(filtered_items):
-                    is_last = (idx == len(filtered_items) - 1)
-                    full_path = os.path.join(current_path, item)
-
-                    # Add current item
-                    lines.append(format_tree_line(item, prefix, is_last))
-
-                    # Recursively process directories
-                    if os.path.isdir(full_path) and item in dirs:
-                        new_prefix = prefix + ("    " if is_last else "│   ")
-                        subtree = build_tree(full_path, new_prefix)
-                        if subtree:  # Only add non-empty directories
-                            lines.extend(subtree)
-
-                return lines
 
-            except OSError as e:
-                debug_print("Error accessing directory {}: {}".format(current_path, str(e)))
-                return []
+                        # Apply file filters
+                        if file_processor.should_process_path(entry.path, is_dir=False):
+                            files.append(entry.name)
+                            # One concat per file; the parent's relative
+                            # prefix is carried down the recursion instead
+                            # of being re-derived from the full path
+                            all_files.append(rel_parent + entry.name)
+            return dirs, files
+
+        def push_children(stack, node, prefix):
+            """Push a node's entries reversed so they pop in display order."""
+            dirs, files = node
+            items = sorted(dirs) + sorted(files)
+            last_idx = len(items) - 1
+            for idx in range(last_idx, -1, -1):
+                item = items[idx]
+                stack.append((item, dirs.get(item), prefix, idx == last_idx))
+
+        def format_tree(root, lines):
+            """Emit tree lines iteratively; one flat stack instead of a
+            recursive call (and an intermediate list) per directory."""
+            stack = []
+            push_children(stack, root, "")
+            while stack:
+                name, child, prefix, is_last = stack.pop()
+                lines.append(prefix + _TREE_TEE[is_last] + name)
+                if child is not None:
+                    push_children(stack, child, prefix + _TREE_PAD[is_last])
 
         try:
+            root = collect(base_dir, "")
+            all_files.sort()  # Sort for consistent output
+
             # Only show root directory if it contains files we want
-            if not get_directory_with_included_files(base_dir):
-                return ""
+            if not (root[0] or root[1]):
+                return "", all_files
 
             # Start with base directory name
-            base_name = os.path.basename(base_dir)
-            tree_lines = [base_name]
-
-            # Build the tree structure
-            subtree = build_tree(base_dir)
-            if subtree:
-                tree_lines.extend(subtree)
-
-            return "\n".join(tree_lines)
+            tree_lines = [os.path.basename(base_dir)]
+            format_tree(root, tree_lines)
+            return "\n".join(tree_lines), all_files
 
         except Exception as e:
             error_msg = "Error generating directory tree: {}".format(str(e))
             debug_print(error_msg)
-            return "Error generating directory tree"
+            return "Error generating directory tree", all_files
 
     def insert_code_blocks(self, content, directory, config):
         """Insert code blocks from files into markdown content."""
@@ -300,16 +338,25 @@ class MarkdownProcessor:
         debug_print("Content length: {} characters".format(len(content)))
         debug_print("Directory: {}".format(directory))
 
-        code_block_pattern = r'```([^\n]*)\n([\s\S]*?)```'
-        matches = list(re.finditer(code_block_pattern, content))
+        matches = list(CODE_BLOCK_RE.finditer(content))
         debug_print("Found {} code blocks".format(len(matches)))
 
+        # Existence probes below go through one cached scandir per
+        # directory instead of a stat per block
+        path_processor = self.parent.path_processor
+        path_processor.reset_existence_cache()
+
+        # Collected as (span, replacement) and applied in one pass below;
+        # replacing match text in the whole document per block rescanned
+        # it each time and could hit an identical block elsewhere
+        edits = []
+
         for i, match in enumerate(matches):
             lang_or_filename = match.group(1)
             code = match.group(2)
-            debug_print("Processing block {}:".format(i+1))
-            debug_print("Language/filename: {}".format(lang_or_filename))
-            debug_print("Code length: {} characters".format(len(code)))
+            debug_print("Processing block %d:", i + 1)
+            debug_print("Language/filename: %s", lang_or_filename)
+            debug_print("Code length: %d characters", len(code))
 
             filename = self.parent.code_processor.get_filename_from_block(
                 lang_or_filename, code, None, config)
@@ -320,33 +367,49 @@ class MarkdownProcessor:
 
             try:
                 file_path = os.path.join(directory, filename)
-                debug_print("Attempting to write to: {}".format(file_path))
-
-                if os.path.exists(file_path):
-                    debug_print("File exists: {}".format(file_path))
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        updated_code = f.read().strip()
-                        
-                        # If the file contains code fences, indent them for markdown
-                        if '```' in updated_code:
-                            updated_code = self.indent_nested_fences(updated_code)
-                        
-                        content = content.replace(
-                            match.group(0),
-                            "```{}\n{}\n```".format(lang_or_filename or '', updated_code)
-                        )
-                        debug_print("Updated content with file contents")
+                debug_print("Attempting to write to: %s", file_path)
+
+                if path_processor.path_exists(file_path):
+                    debug_print("File exists: %s", file_path)
+                    # Same sized single-read pattern as the command-level
+                    # loops; the default 8 KiB buffer costs a syscall per
+                    # chunk on larger sources
+                    fd = os.open(file_path, os.O_RDONLY)
+                    try:
+                        data = os.read(fd, os.fstat(fd).st_size)
+                    finally:
+                        os.close(fd)
+                    updated_code = data.decode('utf-8').strip()
+
+                    # If the file contains code fences, indent them for markdown
+                    if '```' in updated_code:
+                        updated_code = self.indent_nested_fences(updated_code)
+
+                    edits.append((match.span(),
+                                  "```{}\n{}\n```".format(lang_or_filename or '', updated_code)))
+                    debug_print("Updated content with file contents")
                 else:
-                    debug_print("Creating new file: {}".format(file_path))
-                    # Ensure directory exists
-                    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                    debug_print("Creating new file: %s", file_path)
+                    # Ensure directory exists (cached across this pass)
+                    path_processor.ensure_directory_exists(file_path)
                     with open(file_path, 'w', encoding='utf-8') as f:
                         f.write(code.strip())
-                    debug_print("Created file: {}".format(file_path))
+                    path_processor.mark_exists(file_path)
+                    debug_print("Created file: %s", file_path)
 
             except Exception as e:
                 debug_print("Error processing {}: {}".format(filename, str(e)))
 
+        if edits:
+            out = []
+            last = 0
+            for (start, end), replacement in edits:
+                out.append(content[last:start])
+                out.append(replacement)
+                last = end
+            out.append(content[last:])
+            content = ''.join(out)
+
         try:
             # Save changes back to markdown file
             if self.view and self.view.file_name():
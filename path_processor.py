@@ -38,6 +38,38 @@ class PathProcessor:
     def __init__(self, parent):
         self.parent = parent
         self.view = parent.view
+        self._existence_cache = {}
+        self._abs_base_cache = {}
+        self._created_dirs = set()
+
+    def reset_existence_cache(self):
+        """Drop cached directory listings before a new extract/insert pass."""
+        self._existence_cache = {}
+        self._created_dirs = set()
+
+    def path_exists(self, path):
+        """Check if a path exists using one cached scandir per directory.
+
+        Conflict handling probes many candidate names in the same output
+        directory; caching the listing replaces per-probe stat syscalls
+        with set membership tests.
+        """
+        directory, name = os.path.split(os.path.normpath(path))
+        names = self._existence_cache.get(directory)
+        if names is None:
+            try:
+                names = {entry.name for entry in os.scandir(directory)}
+            except OSError:
+                names = set()
+            self._existence_cache[directory] = names
+        return name in names
+
+    def mark_exists(self, path):
+        """Record a newly written path in the existence cache."""
+        directory, name = os.path.split(os.path.normpath(path))
+        names = self._existence_cache.get(directory)
+        if names is not None:
+            names.add(name)
 
     def ensure_directory_exists(self, filepath):
         """Create directory structure for a given filepath if it doesn't exist."""
@@ -47,8 +79,19 @@ class PathProcessor:
         directory = os.path.dirname(filepath)
         if not directory:
             return True
+        # Blocks routinely target the same few directories; skip the
+        # makedirs (a stat per path component even when nothing is
+        # missing) once a directory is known to exist
+        if directory in self._created_dirs:
+            return True
         try:
             os.makedirs(directory, exist_ok=True)
+            self._created_dirs.add(directory)
+            # Parents necessarily exist too
+            parent = os.path.dirname(directory)
+            while parent and parent not in self._created_dirs:
+                self._created_dirs.add(parent)
+                parent = os.path.dirname(parent)
             return True
         except OSError as e:
             if e.errno == errno.EEXIST and os.path.isdir(directory):
@@ -61,9 +104,10 @@ class PathProcessor:
 
     def resolve_output_path(self, base_dir, filename, config):
         """Resolve the output path for a file, handling conflicts according to config."""
-        base_dir = os.path.normpath(base_dir)
-        filename = os.path.normpath(filename)
-        output_path = os.path.join(base_dir, filename)
+        # One normpath after the join; the filename arrives normalized
+        # from get_filename_from_block and base_dir is absolutized (and
+        # thereby normalized) inside is_within_directory
+        output_path = os.path.normpath(os.path.join(base_dir, filename))
 
         # Check if path attempts to escape base directory
         if not self.is_within_directory(base_dir, output_path):
@@ -72,7 +116,7 @@ class PathProcessor:
                 sublime.error_message("Invalid path: {} attempts to escape base directory".format(filename))
             return None
 
-        if os.path.exists(output_path):
+        if self.path_exists(output_path):
             conflict_handling = config.get('handle_file_conflicts', 'prepend_and_comment')
             debug_print("File exists, using conflict handling: {}".format(conflict_handling))
 
@@ -85,16 +129,26 @@ class PathProcessor:
 
     def is_within_directory(self, directory, target):
         """Check if target path is within the specified directory."""
-        directory = os.path.abspath(directory)
-        target = os.path.abspath(target)
-        relative = os.path.relpath(target, directory)
-        return not relative.startswith(os.pardir)
+        # The base directory repeats for every block in a pass, so cache
+        # its absolutized form; the trailing separator stops a sibling
+        # like /foobar from passing as inside /foo
+        base = self._abs_base_cache.get(directory)
+        if base is None:
+            base = os.path.abspath(directory) + os.sep
+            self._abs_base_cache[directory] = base
+        # Targets are joined onto an absolute base, so normpath is enough;
+        # abspath would add a getcwd syscall per checked block
+        if os.path.isabs(target):
+            target_abs = os.path.normpath(target)
+        else:
+            target_abs = os.path.abspath(target)
+        return target_abs + os.sep == base or target_abs.startswith(base)
 
     def _handle_append_n(self, path):
         """Handle file conflict by appending incrementing number."""
         base, ext = os.path.splitext(path)
         counter = 1
-        while os.path.exists("{}_{}{}".format(base, counter, ext)):
+        while self.path_exists("{}_{}{}".format(base, counter, ext)):
             counter += 1
         return "{}_{}{}".format(base, counter, ext)
 
@@ -105,15 +159,16 @@ class PathProcessor:
             os.makedirs(backup_dir)
         backup_path = os.path.join(backup_dir, os.path.basename(path))
 
-        if os.path.exists(backup_path):
+        if self.path_exists(backup_path):
             base, ext = os.path.splitext(backup_path)
             counter = 1
-            while os.path.exists("{}_{}{}".format(base, counter, ext)):
+            while self.path_exists("{}_{}{}".format(base, counter, ext)):
                 counter += 1
             backup_path = "{}_{}{}".format(base, counter, ext)
 
         if os.path.exists(path):
             os.rename(path, backup_path)
+            self.mark_exists(backup_path)
         return path
 
     def get_all_parent_directories(self, filepath, base_dir):
@@ -143,31 +198,55 @@ class PathProcessor:
 
     def get_files_recursive(self, directory, config):
         """Gets all files in directory and subdirectories, applying filtering rules."""
-        debug_print("Scanning directory: {}".format(directory))
+        debug_print("Scanning directory: %s", directory)
         files = []
+
+        # Hoist the per-walk invariants out of the loops
+        directories_to_include = config.get('directories_2_include')
+        directories_to_ignore = config.get('directories_2_ignore')
+        include_system = config.get('include_system_folders', False)
+        base = directory.rstrip(os.sep)
+        prefix_len = len(base) + 1
+
         try:
-            for root, dirs, filenames in os.walk(directory):
-                # Filter directories based on config
-                if config.get('directories_2_include'):
-                    dirs[:] = [d for d in dirs if d in config['directories_2_include']]
-                elif config.get('directories_2_ignore'):
-                    dirs[:] = [d for d in dirs if d not in config['directories_2_ignore']]
-
-                debug_print("Found directory: {}".format(root))
+            # fwalk keeps a file descriptor per directory and resolves
+            # entries with openat/fstatat, cutting the per-component path
+            # lookups os.walk repeats on nested trees. Not available on
+            # Windows, so keep the walk fallback.
+            if hasattr(os, 'fwalk'):
+                walker = ((root, dirs, filenames)
+                          for root, dirs, filenames, _rootfd
+                          in os.fwalk(base, follow_symlinks=False))
+            else:
+                walker = os.walk(base, topdown=True, followlinks=False)
+            for root, dirs, filenames in walker:
+                # Filter directories based on config; pruning here skips the
+                # whole subtree instead of filtering its entries later
+                if directories_to_include:
+                    dirs[:] = [d for d in dirs if d in directories_to_include]
+                elif directories_to_ignore:
+                    dirs[:] = [d for d in dirs if d not in directories_to_ignore]
+                if not include_system:
+                    dirs[:] = [d for d in dirs if not d.startswith('.')]
+
+                debug_print("Found directory: %s", root)
                 for filename in filenames:
-                    if filename.startswith('.') and not config.get('include_system_folders', False):
+                    if filename.startswith('.') and not include_system:
                         continue
                     full_path = os.path.join(root, filename)
-                    rel_path = self.get_relative_path(full_path, directory)
+                    # Prefix trim instead of os.path.relpath, which
+                    # normalizes both paths on every call
+                    rel_path = full_path[prefix_len:]
 
                     # Use FileProcessor's should_process_path method through parent
                     if self.parent.file_processor.should_process_path(full_path):
                         files.append(rel_path)
                         # debug_print("Added file: {}".format(rel_path))
                     else:
-                        debug_print("Skipped file: {}".format(rel_path))
+                        debug_print("Skipped file: %s", rel_path)
 
-            return sorted(files)  # Sort for consistent output
+            files.sort()  # Sort for consistent output
+            return files
         except Exception as e:
             debug_print("Error scanning directory: {}".format(str(e)))
             return []
@@ -1,8 +1,36 @@
 import os
 import json
 import re
+import functools
 from .utils import debug_print
 
+# Compiled once; extract_settings_from_markdown scans the whole buffer
+# with this on every settings lookup.
+CODE_BLOCK_RE = re.compile(r'```([^\n]*)\n([\s\S]*?)```')
+
+@functools.lru_cache(maxsize=8)
+def _parse_settings_file(settings_path, mtime):
+    """Parse a project settings file, memoized on (path, mtime).
+
+    The mtime key means an edited file re-parses while repeated command
+    invocations against an unchanged file hit the cache.
+    """
+    with open(settings_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def load_settings_file(settings_path):
+    """Load a project settings file through the mtime-keyed parse cache.
+
+    Returns a fresh shallow copy so callers can modify their settings
+    dict without corrupting the cached parse, or None on any error.
+    """
+    try:
+        mtime = os.path.getmtime(settings_path)
+        return dict(_parse_settings_file(settings_path, mtime))
+    except Exception as e:
+        debug_print("Error loading settings file {}: {}".format(settings_path, e))
+        return None
+
 class ProjectSettings:
     def __init__(self, parent):
         self.parent = parent
@@ -18,8 +46,7 @@ class ProjectSettings:
         settings_filename = self.get_settings_filename(directory)
         debug_print("Searching for {} in markdown content".format(settings_filename))
 
-        code_block_pattern = r'```([^\n]*)\n([\s\S]*?)```'
-        matches = re.finditer(code_block_pattern, content)
+        matches = CODE_BLOCK_RE.finditer(content)
 
         for match in matches:
             lang_or_filename = match.group(1).strip()
@@ -54,13 +81,10 @@ class ProjectSettings:
 
             # Check for existing file
             if os.path.exists(settings_path):
-                try:
-                    with open(settings_path, 'r', encoding='utf-8') as f:
-                        settings = json.load(f)
+                settings = load_settings_file(settings_path)
+                if settings is not None:
                     debug_print("Using existing project settings")
                     return settings
-                except Exception as e:
-                    debug_print("Error loading project settings: {}".format(e))
 
         # If we should save per-project settings and they don't exist
         if self.parent.config.get('save_settings_per_project', True):
@@ -94,17 +118,12 @@ class ProjectSettings:
         settings_path = os.path.join(directory, settings_filename)
 
         # Get current settings
-        try:
-            if os.path.exists(settings_path):
-                with open(settings_path, 'r', encoding='utf-8') as f:
-                    settings = json.load(f)
-            else:
-                settings = self.parent.config.copy()
-                # Save settings file
-                self.save_project_settings(directory, settings)
-        except Exception as e:
-            debug_print("Error loading settings, using defaults: {}".format(e))
+        settings = None
+        if os.path.exists(settings_path):
+            settings = load_settings_file(settings_path)
+        if settings is None:
             settings = self.parent.config.copy()
+            # Save settings file
             self.save_project_settings(directory, settings)
 
         # Format as markdown block
@@ -28,31 +28,50 @@ except ImportError:
 
     sublime = MockSublime()
 
+# Flipped from settings in plugin_loaded / handle_settings_change so the
+# hot paths test one module-level boolean instead of re-reading settings
+# on every call.
+DEBUG_ENABLED = False
+
+def refresh_debug_flag():
+    """Sync DEBUG_ENABLED with the enable_debug_output setting."""
+    global DEBUG_ENABLED
+    if SUBLIME_AVAILABLE:
+        try:
+            settings = sublime.load_settings("Markdown2Dir.sublime-settings")
+            DEBUG_ENABLED = bool(settings and settings.get("enable_debug_output", False))
+        except Exception:
+            DEBUG_ENABLED = False
+
 def debug_print(*args, **kwargs):
-    """Print debug messages with line numbers, handling multiline strings."""
+    """Print debug messages with line numbers, handling multiline strings.
+
+    Supports logging-style lazy formatting: debug_print("read %s", path)
+    defers the interpolation until after the enabled check, so disabled
+    calls never materialize the message.
+    """
     global DEBUG_COUNT
-    global SUBLIME_AVAILABLE
-    try:
-        if SUBLIME_AVAILABLE:
-            settings = sublime.load_settings("Markdown2Dir.sublime-settings")
-            if settings and not sublime.get("enable_debug_output", False):
-                return
-    except Exception:
-        pass # Fall back to always printing in case of errors
-    # Convert all arguments to strings and join them
-    message = " ".join(str(arg) for arg in args)
-
-    # Handle multiline messages
-    if "\n" in message:
-        lines = message.split("\n")
-        for line in lines:
-            if line.strip():  # Only process non-empty lines
-                debug_print(line, **kwargs)
+    if not DEBUG_ENABLED:
         return
-
-    # Process single line
-    DEBUG_COUNT += 1
-    print("{}\t| {}".format(str(DEBUG_COUNT), message), **kwargs)
+    if len(args) > 1 and isinstance(args[0], str) and '%' in args[0]:
+        try:
+            message = args[0] % args[1:]
+        except (TypeError, ValueError):
+            message = " ".join(str(arg) for arg in args)
+    else:
+        # Convert all arguments to strings and join them
+        message = " ".join(str(arg) for arg in args)
+
+    # Number each non-empty line and emit everything with one write;
+    # recursing per line paid a print (two stdout writes and a lock
+    # acquisition) for every line of a multiline message
+    buf = []
+    for line in message.splitlines():
+        if line.strip():
+            DEBUG_COUNT += 1
+            buf.append("%d\t| %s\n" % (DEBUG_COUNT, line))
+    if buf:
+        sys.stdout.write("".join(buf))
 
 def show_error_message(message):
     """Displays a user-friendly error message in Sublime Text."""
@@ -63,6 +82,7 @@ def show_error_message(message):
 
 def plugin_loaded():
     """Called when the plugin is loaded."""
+    refresh_debug_flag()
     debug_print("Markdown2Dir plugin loaded")
     debug_print("SUBLIME_AVAILABLE =", SUBLIME_AVAILABLE)
     if SUBLIME_AVAILABLE:
@@ -76,6 +96,7 @@ def handle_settings_change():
     """Handle settings changes by clearing the cache."""
     from .markdown_base_command import MarkdownBaseCommand
     MarkdownBaseCommand.clear_config_cache()
+    refresh_debug_flag()
 
 def validate_config(config):
     required_fields = {